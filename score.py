@@ -1,6 +1,12 @@
 import sys
 import os
 import glob
+import functools
+import io
+import contextlib
+import multiprocessing
+
+import numpy as np
 
 def parse_input(file_path):
     try:
@@ -11,21 +17,28 @@ def parse_input(file_path):
         num_vertices = int(next(iterator))
         num_edges = int(next(iterator))
         
-        # Dictionary to store flow: key=(u, v), value=flow
-        network_flow = {}
-        
+        # edge_index maps (u, v) to its slot in flow_arr, which holds the
+        # flow per distinct edge (duplicate edges are merged into one slot)
+        edge_index = {}
+        flows = []
+
         for _ in range(num_edges):
             u = int(next(iterator))
             v = int(next(iterator))
             capacity = int(next(iterator))
-            
-            # Check for duplicate edges if necessary, otherwise set flow
-            if (u, v) in network_flow:
-                network_flow[(u, v)] += capacity
+
+            slot = edge_index.get((u, v))
+            if slot is not None:
+                flows[slot] += capacity
             else:
-                network_flow[(u, v)] = capacity
-                
-        return num_vertices, num_edges, network_flow
+                edge_index[(u, v)] = len(flows)
+                flows.append(capacity)
+
+        # Flow values as a contiguous array, so checks over all edges can
+        # use NumPy reductions instead of Python-level dict iteration
+        flow_arr = np.array(flows, dtype=np.int64)
+
+        return num_vertices, num_edges, edge_index, flow_arr
     except StopIteration:
         raise ValueError("Input file is incomplete or formatted incorrectly.")
     except Exception as e:
@@ -50,22 +63,24 @@ def parse_output(file_path):
         
         current_line_idx = 1
         
-        # Parse Paths
+        # Parse Paths. Each line is tokenized in C by np.fromstring instead
+        # of allocating a Python int per token; nodes stay an int64 array
+        # ready for the vectorized flow accumulation in verify_solution.
         for _ in range(num_paths):
             if current_line_idx >= len(lines):
                 raise ValueError("Output file missing path definitions.")
-            parts = list(map(int, lines[current_line_idx].split()))
-            weight = parts[0]
+            parts = np.fromstring(lines[current_line_idx], dtype=np.int64, sep=' ')
+            weight = int(parts[0])
             path_nodes = parts[1:] # The sequence of vertices
             paths.append({'weight': weight, 'nodes': path_nodes})
             current_line_idx += 1
-            
+
         # Parse Cycles
         for _ in range(num_cycles):
             if current_line_idx >= len(lines):
                 raise ValueError("Output file missing cycle definitions.")
-            parts = list(map(int, lines[current_line_idx].split()))
-            weight = parts[0]
+            parts = np.fromstring(lines[current_line_idx], dtype=np.int64, sep=' ')
+            weight = int(parts[0])
             cycle_nodes = parts[1:] # The sequence of vertices
             cycles.append({'weight': weight, 'nodes': cycle_nodes})
             current_line_idx += 1
@@ -75,20 +90,45 @@ def parse_output(file_path):
         raise ValueError(f"Error parsing output file: {e}")
 
 
+@functools.lru_cache(maxsize=None)
+def _parse_input_cached(file_path, mtime):
+    return parse_input(file_path)
+
+
+def parse_input_memo(file_path):
+    """parse_input memoized on (path, mtime), so each graph file is read once."""
+    return _parse_input_cached(file_path, os.path.getmtime(file_path))
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_output_cached(file_path, mtime):
+    return parse_output(file_path)
+
+
+def parse_output_memo(file_path):
+    """parse_output memoized on (path, mtime), so each truth/output file is read once."""
+    return _parse_output_cached(file_path, os.path.getmtime(file_path))
+
+
 def validate_test(graph_file, truth_file):
 
-    V, E, original_flow = parse_input(graph_file)
-    paths, cycles = parse_output(truth_file)
+    V, E, edge_index, flow_arr = parse_input_memo(graph_file)
+    paths, cycles = parse_output_memo(truth_file)
 
-    if V > 50 or E > 100 or max(original_flow.values(), default=0) > 1000:
+    # Cheapest checks first so invalid tests short-circuit before the
+    # verify_solution call below
+    if V > 50 or E > 100:
         return False
-    
+
     if len(paths) > 20 or len(cycles) > 20:
         return False
-    
+
+    if flow_arr.max(initial=0) > 1000:
+        return False
+
     if verify_solution(graph_file, truth_file, truth_file, True) == 0:
         return False
-    
+
     return True
 
 
@@ -98,15 +138,11 @@ def verify_solution(input_file, truth_file, output_file, test):
     """
     print(f"Verifying {output_file} against {input_file}...")
     try:
-        V, _, original_flow = parse_input(input_file)
-        paths, cycles = parse_output(output_file)
-        with open(truth_file, 'r') as f:
-            lines = [l.strip() for l in f.readlines() if l.strip()]    
-        if not lines:
-            raise ValueError("Truth file is empty.")
-        header = lines[0].split()
-        num_paths_opt = int(header[0])
-        num_cycles_opt = int(header[1])
+        V, _, edge_index, original_flow_arr = parse_input_memo(input_file)
+        paths, cycles = parse_output_memo(output_file)
+        truth_paths, truth_cycles = parse_output_memo(truth_file)
+        num_paths_opt = len(truth_paths)
+        num_cycles_opt = len(truth_cycles)
 
         if not test:
             if not validate_test(input_file, truth_file):
@@ -122,43 +158,51 @@ def verify_solution(input_file, truth_file, output_file, test):
     source = 1
     sink = V
 
-    calculated_flow = {edge: 0 for edge in original_flow}
+    calculated_flow = np.zeros(original_flow_arr.shape[0], dtype=np.int64)
 
     for idx, p in enumerate(paths):
         w = p['weight']
         nodes = p['nodes']
-        
+
         if nodes[0] != source or nodes[-1] != sink:
-            print(f"FAIL: Path {idx+1} does not start at Source (1) or end at Sink ({sink}). Path: {nodes}")
+            print(f"FAIL: Path {idx+1} does not start at Source (1) or end at Sink ({sink}). Path: {nodes.tolist()}")
             return False
-            
+
+        slots = np.empty(len(nodes) - 1, dtype=np.intp)
         for i in range(len(nodes) - 1):
             u, v = nodes[i], nodes[i+1]
-            if (u, v) not in calculated_flow:
+            slot = edge_index.get((u, v))
+            if slot is None:
                 print(f"FAIL: Path {idx+1} uses non-existent edge ({u}, {v}).")
                 return False
-            calculated_flow[(u, v)] += w
+            slots[i] = slot
+        # Unbuffered scatter-add: handles repeated slots within one path
+        np.add.at(calculated_flow, slots, w)
 
     for idx, c in enumerate(cycles):
         w = c['weight']
         nodes = c['nodes']
-        
+
+        slots = np.empty(len(nodes) - 1, dtype=np.intp)
         for i in range(len(nodes)-1):
             u = nodes[i]
             v = nodes[(i + 1)]
-            
-            if (u, v) not in calculated_flow:
+
+            slot = edge_index.get((u, v))
+            if slot is None:
                 print(f"FAIL: Cycle {idx+1} uses non-existent edge ({u}, {v}).")
                 return False
-            calculated_flow[(u, v)] += w
-
-    is_valid = True
-    for edge, flow in original_flow.items():
-        calc = calculated_flow[edge]
-        if calc != flow:
-            print(f"FAIL: Flow mismatch on edge {edge}. Expected {flow}, got {calc}.")
-            is_valid = False
-            
+            slots[i] = slot
+        np.add.at(calculated_flow, slots, w)
+
+    mismatched = np.nonzero(calculated_flow != original_flow_arr)[0]
+    is_valid = mismatched.size == 0
+    if not is_valid:
+        edges = list(edge_index)
+        for slot in mismatched:
+            print(f"FAIL: Flow mismatch on edge {edges[slot]}. "
+                  f"Expected {original_flow_arr[slot]}, got {calculated_flow[slot]}.")
+
     if is_valid:
         print("SUCCESS: The solution is a valid flow decomposition.")
         print(f"Total Paths: {len(paths)}, Total Cycles: {len(cycles)}, Net Total: {len(paths) + len(cycles)}")
@@ -168,24 +212,40 @@ def verify_solution(input_file, truth_file, output_file, test):
         return 0
 
 
+def verify_one(task):
+    """
+    Verifies a single (graph_file, truth_file, output_file) task in a worker
+    process. Output is captured so the main process can print results in
+    order. Returns (graph_file, score, log_text).
+    """
+    graph_file, truth_file, output_file = task
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            score = verify_solution(graph_file, truth_file, output_file, False)
+    except Exception as e:
+        print(f"Execution Error for {graph_file}: {e}", file=log)
+        score = 0
+    return graph_file, score, log.getvalue()
+
+
 if __name__ == "__main__":
 
     if len(sys.argv) < 3:
         print("Usage: python score.py <test_input_file> <student_output_file>")
         sys.exit(1)
-    
+
     test_file_path = sys.argv[1]
     output_file_path = sys.argv[2]
 
     graph_files = glob.glob(os.path.join(test_file_path, "*.graph"))
 
-    total_score = 0
-    
+    tasks = []
     for graph_file in graph_files:
         base_name = os.path.splitext(os.path.basename(graph_file))[0]
         truth_file = os.path.join(test_file_path, f"{base_name}.truth")
         student_output_file = os.path.join(output_file_path, f"{base_name}.out")
-        
+
         if not os.path.exists(truth_file):
             print(f"Truth file {truth_file} does not exist. Skipping...")
             continue
@@ -193,12 +253,21 @@ if __name__ == "__main__":
         if not os.path.exists(student_output_file):
             print(f"Output file {student_output_file} does not exist. Skipping...")
             continue
-        try:
-            score = verify_solution(graph_file, truth_file, student_output_file, False)
-            total_score += score
-        except Exception as e:
-            print(f"Execution Error for {graph_file}: {e}")
-    
+        tasks.append((graph_file, truth_file, student_output_file))
+
+    # Verification is independent per file, so fan it out over all cores;
+    # results are collected and printed in task order in the main process
+    total_score = 0
+    results = {}
+    with multiprocessing.Pool(os.cpu_count()) as pool:
+        for graph_file, score, log_text in pool.imap_unordered(verify_one, tasks, chunksize=4):
+            results[graph_file] = (score, log_text)
+
+    for graph_file, _, _ in tasks:
+        score, log_text = results[graph_file]
+        print(log_text, end="")
+        total_score += score
+
     score_file = "test_scores.txt"
 
     try: